@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Database initialization script for the dsp_db container.
+
+Creates (or migrates) the SQLite database used by the natural query
+processing platform backend, seeds the ``app_info`` metadata table, and
+writes connection artifacts (``db_connection.txt`` and
+``db_visualizer/sqlite.env``) for the other containers to consume.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+DB_FILE = "myapp.db"
+
+# Bumped whenever the schema below changes; stored in the database header
+# via PRAGMA user_version so re-runs can skip migration work entirely.
+CURRENT_SCHEMA_VERSION = 2
+
+APP_INFO_SEED = (
+    ("project_name", "dsp_db"),
+    ("version", "0.1.0"),
+    ("author", "John Doe"),
+    ("description", ""),
+)
+
+# Single source of truth for the schema SQL. The create and migrate
+# paths share these constants byte-for-byte, so sqlite3's statement
+# cache (keyed by SQL text) gets guaranteed hits across both.
+SQL_CREATE_APP_INFO = """
+CREATE TABLE IF NOT EXISTS app_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)"""
+
+SQL_CREATE_USERS = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL DEFAULT '',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP
+)"""
+
+SQL_CREATE_IDX_USERS_USERNAME = (
+    "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)"
+)
+
+SQL_CREATE_IDX_USERS_EMAIL = (
+    "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)"
+)
+
+SQL_INSERT_APP_INFO = (
+    "INSERT OR REPLACE INTO app_info (key, value) VALUES (?, ?)"
+)
+
+# Parameterless DDL for a fresh database, executed as one batch so SQLite
+# parses and steps the whole bundle in a single C-side loop. The script
+# opens the transaction itself (executescript commits any transaction
+# already in progress) and deliberately has no COMMIT: seeding and the
+# version stamp join it, and the caller commits all of it as one unit.
+DDL_SQL = "BEGIN;\n" + ";\n".join(
+    (
+        SQL_CREATE_APP_INFO,
+        SQL_CREATE_USERS,
+        SQL_CREATE_IDX_USERS_USERNAME,
+        SQL_CREATE_IDX_USERS_EMAIL,
+    )
+) + ";"
+
+
+def _configure_connection(conn):
+    """Enable foreign keys and apply performance PRAGMAs.
+
+    WAL mode with synchronous=NORMAL turns schema writes into append-only
+    WAL frames and drops the per-statement fsync pair of the default
+    rollback journal. page_size must be set before any table is created
+    to take effect on a fresh database.
+    """
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA page_size = 4096")
+    journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    if journal_mode.lower() != "wal":
+        print(f"Warning: journal_mode is {journal_mode}, expected wal")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def _table_exists(cursor, table):
+    """Return True if a table with the given name exists."""
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+        (table,),
+    )
+    return cursor.fetchone() is not None
+
+
+def _get_columns(cursor, table):
+    """Return the set of column names for the given table.
+
+    pragma_table_info takes the table name as a bind parameter, so one
+    cached prepared statement serves every table (and the name is never
+    interpolated into SQL text).
+    """
+    cursor.execute("SELECT name FROM pragma_table_info(?)", (table,))
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _create_base_schema(cursor):
+    """Create the full schema from scratch on a fresh database.
+
+    DDL_SQL begins a transaction and leaves it open (see its comment);
+    the caller seeds app_info within it and commits or rolls back.
+    """
+    cursor.executescript(DDL_SQL)
+
+
+def _seed_app_info(cursor):
+    """Insert (or refresh) the app_info metadata rows."""
+    cursor.executemany(SQL_INSERT_APP_INFO, APP_INFO_SEED)
+
+
+def _migrate_existing_db(cursor):
+    """Bring an existing database up to the current schema."""
+    # One header read answers "already migrated?" without any DDL or
+    # introspection round-trips.
+    cursor.execute("PRAGMA user_version")
+    if cursor.fetchone()[0] >= CURRENT_SCHEMA_VERSION:
+        return
+
+    # Fetch the column list once and reuse it instead of re-running
+    # PRAGMA table_info per check.
+    users_cols = _get_columns(cursor, "users")
+
+    if "password_hash" not in users_cols:
+        # The constant default backfills existing rows without rewriting
+        # their pages, so no follow-up UPDATE is needed.
+        cursor.execute(
+            "ALTER TABLE users "
+            "ADD COLUMN password_hash TEXT NOT NULL DEFAULT ''"
+        )
+    if "last_login" not in users_cols:
+        cursor.execute("ALTER TABLE users ADD COLUMN last_login TIMESTAMP")
+
+    # IF NOT EXISTS already makes these idempotent; no guard needed.
+    cursor.execute(SQL_CREATE_IDX_USERS_USERNAME)
+    cursor.execute(SQL_CREATE_IDX_USERS_EMAIL)
+    cursor.execute(SQL_CREATE_APP_INFO)
+    _seed_app_info(cursor)
+    cursor.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}")
+
+
+def _schema_mtime():
+    """Return the modification time of this schema script."""
+    return os.path.getmtime(__file__)
+
+
+def _db_schema_version(db_file):
+    """Return the user_version stored in db_file, or 0 if unreadable."""
+    try:
+        conn = sqlite3.connect(db_file)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+
+
+def _write_connection_info(db_file, db_path_abs):
+    """Write a human-readable connection summary next to the script."""
+    with open("db_connection.txt", "w") as f:
+        f.write("SQLite Database Connection Information\n")
+        f.write("=" * 40 + "\n")
+        f.write(f"Database file: {db_file}\n")
+        f.write(f"Full path: {db_path_abs}\n")
+        f.write(f"Connection string: sqlite:///{db_path_abs}\n")
+
+
+def _write_sqlite_env(db_path_abs):
+    """Write sqlite.env for the db_visualizer container."""
+    os.makedirs("db_visualizer", exist_ok=True)
+    with open(os.path.join("db_visualizer", "sqlite.env"), "w") as f:
+        f.write(f'SQLITE_DB="{db_path_abs}"\n')
+        f.write('SQLITE_USER="appuser"\n')
+        f.write('SQLITE_PASSWORD="dbuser123"\n')
+
+
+def main():
+    """Initialize or migrate the SQLite database."""
+    # One write() per report instead of one per print call.
+    sys.stdout.write(
+        f"Starting SQLite database setup...\nDatabase file: {DB_FILE}\n"
+    )
+
+    db_file = DB_FILE
+    db_path_abs = os.path.join(os.getcwd(), db_file)
+    db_exists = os.path.exists(db_file)
+
+    # The connection artifacts depend only on the paths, so write them on
+    # worker threads while SQLite does its file I/O (both release the GIL).
+    executor = ThreadPoolExecutor(max_workers=2)
+    artifact_futures = [
+        executor.submit(_write_connection_info, db_file, db_path_abs),
+        executor.submit(_write_sqlite_env, db_path_abs),
+    ]
+
+    # The outer finally consumes the futures on every exit path, so a
+    # writer failure is surfaced even when the DB work itself raises.
+    try:
+        # Fast path: a database written after this script last changed is
+        # already at the current schema, so skip the full setup and just
+        # refresh the connection artifacts. mtime alone is not proof of a
+        # successful run (connect() creates the file and a rolled-back
+        # run still bumps it), so also require the stored schema version
+        # — one header read — before trusting it.
+        if (
+            db_exists
+            and os.path.getmtime(db_file) > _schema_mtime()
+            and _db_schema_version(db_file) >= CURRENT_SCHEMA_VERSION
+        ):
+            for future in artifact_futures:
+                future.result()
+            sys.stdout.write(
+                "\n".join(
+                    [
+                        "Database already up to date, skipping setup.",
+                        "Connection info written to: db_connection.txt",
+                        "Environment file written to:"
+                        " db_visualizer/sqlite.env",
+                    ]
+                )
+                + "\n"
+            )
+            return
+
+        # isolation_level=None: manual transaction control, one
+        # BEGIN/COMMIT around the whole schema setup instead of a commit
+        # (and fsync) per statement. The enlarged statement cache keeps
+        # every DDL/seed statement prepared across re-runs.
+        conn = sqlite3.connect(
+            db_file,
+            isolation_level=None,
+            cached_statements=256,
+            check_same_thread=False,
+        )
+        created = False
+        committed = False
+        try:
+            _configure_connection(conn)
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+
+            created = not (db_exists and _table_exists(cursor, "users"))
+            if created:
+                print("Creating database schema...")
+                # The DDL batch opens the transaction; seeding and the
+                # version stamp below join it.
+                _create_base_schema(cursor)
+            else:
+                conn.execute("BEGIN")
+            try:
+                if created:
+                    _seed_app_info(cursor)
+                    # Stamp last, inside the transaction, so a failed
+                    # seed rolls the version marker back with it and the
+                    # next run retries instead of reporting success.
+                    cursor.execute(
+                        f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}"
+                    )
+                else:
+                    print("Existing database found, applying migrations...")
+                    _migrate_existing_db(cursor)
+                conn.execute("COMMIT")
+                committed = True
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+            # The schema is fixed (app_info + users, seeded from
+            # APP_INFO_SEED), so the report counts are known without
+            # querying.
+            table_count = 2
+            record_count = len(APP_INFO_SEED)
+        finally:
+            # Seed/update sqlite_stat1 so later backend queries against
+            # the fresh indexes start out with planner statistics. Only
+            # after a successful commit: a rolled-back run must leave
+            # the file untouched, and ANALYZE would write sqlite_stat1
+            # in autocommit mode.
+            if committed:
+                try:
+                    if created:
+                        conn.execute("ANALYZE")
+                    conn.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+            conn.close()
+
+        for future in artifact_futures:
+            future.result()
+    finally:
+        executor.shutdown(wait=True)
+        # No-op after a successful join above; on exceptional paths this
+        # re-raises any writer failure instead of discarding it.
+        for future in artifact_futures:
+            future.result()
+
+    lines = [
+        "",
+        "SQLite setup complete!",
+        f"Database created at: {db_path_abs}",
+        f"Tables created: {table_count}",
+        f"app_info records: {record_count}",
+        "",
+        "Connection info written to: db_connection.txt",
+        "Environment file written to: db_visualizer/sqlite.env",
+        "",
+        "To connect manually:",
+        f"  sqlite3 {db_file}",
+    ]
+    sqlite3_cli = shutil.which("sqlite3")
+    if sqlite3_cli:
+        lines.append(f"sqlite3 CLI available at: {sqlite3_cli}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()